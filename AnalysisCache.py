@@ -0,0 +1,110 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+OFF = "off"
+READ_ONLY = "read-only"
+READ_WRITE = "read-write"
+
+MAX_ENTRIES = 100000
+TOUCH_TIMEOUT = 0.05
+
+
+def positionHash(gs, version=""):
+    """Hash of the search version plus everything that decides the legal moves:
+    board, side to move, castling rights, en passant square."""
+    rights = gs.currentCastlingRight
+    key = version + ":"
+    key += "".join(square for row in gs.board for square in row)
+    key += "w" if gs.whiteToMove else "b"
+    key += "".join("1" if right else "0" for right in (rights.wks, rights.wqs, rights.bks, rights.bqs))
+    key += str(gs.enpassantPossible)
+    return hashlib.sha1(key.encode()).digest()
+
+
+class AnalysisCache():
+    """Best move, score and depth per position, persisted in SQLite and shared by every process using the same file.
+
+    The database runs in WAL mode so readers never block each other or the writer. Once more than
+    maxEntries positions are stored the least recently used ones are evicted. Database errors
+    (a locked or missing file) are treated as cache misses so a search never fails because of the cache.
+
+    version identifies the search and evaluation that produced the entries and is part of every key,
+    so entries written under another version are never returned and age out through eviction.
+    """
+
+    def __init__(self, path, mode=READ_WRITE, version="", maxEntries=MAX_ENTRIES, timeout=5.0):
+        if mode not in (OFF, READ_ONLY, READ_WRITE):
+            raise ValueError("mode must be one of %r, %r, %r" % (OFF, READ_ONLY, READ_WRITE))
+        self.path = path
+        self.mode = mode
+        self.version = version
+        self.maxEntries = maxEntries
+        self.timeout = timeout
+        self.connection = None
+        self.pid = None
+
+    def connect(self):
+        # sqlite connections must not be shared with forked workers, so reconnect per process
+        if self.connection is not None and self.pid == os.getpid():
+            return self.connection
+        if self.mode == READ_ONLY:
+            connection = sqlite3.connect("file:%s?mode=ro" % self.path, uri=True, timeout=self.timeout)
+        else:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS analysis ("
+                               "hash BLOB PRIMARY KEY, moveID INTEGER, score REAL, depth INTEGER, lastUsed REAL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS analysisLastUsed ON analysis (lastUsed)")
+            connection.commit()
+        self.connection = connection
+        self.pid = os.getpid()
+        return connection
+
+    def get(self, gs, depth):
+        """Return (moveID, score) if the position was searched to at least depth, else None."""
+        if self.mode == OFF:
+            return None
+        key = positionHash(gs, self.version)
+        try:
+            connection = self.connect()
+            row = connection.execute("SELECT moveID, score FROM analysis WHERE hash = ? AND depth >= ?",
+                                     (key, depth)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is not None and self.mode == READ_WRITE:
+            self.touch(connection, key)
+        return row
+
+    def touch(self, connection, key):
+        # best effort: when another process holds the write lock the LRU update is skipped, not waited for
+        try:
+            connection.execute("PRAGMA busy_timeout = %d" % (TOUCH_TIMEOUT * 1000))
+            with connection:
+                connection.execute("UPDATE analysis SET lastUsed = ? WHERE hash = ?", (time.time(), key))
+        except sqlite3.Error:
+            pass
+        finally:
+            connection.execute("PRAGMA busy_timeout = %d" % (self.timeout * 1000))
+
+    def put(self, gs, move, score, depth):
+        if self.mode != READ_WRITE or move is None:
+            return
+        try:
+            connection = self.connect()
+            with connection:
+                connection.execute("INSERT INTO analysis (hash, moveID, score, depth, lastUsed) VALUES (?, ?, ?, ?, ?) "
+                                   "ON CONFLICT(hash) DO UPDATE SET moveID = excluded.moveID, score = excluded.score, "
+                                   "depth = excluded.depth, lastUsed = excluded.lastUsed "
+                                   "WHERE excluded.depth >= analysis.depth",
+                                   (positionHash(gs, self.version), move.moveID, score, depth, time.time()))
+                connection.execute("DELETE FROM analysis WHERE hash IN (SELECT hash FROM analysis ORDER BY lastUsed "
+                                   "LIMIT max(0, (SELECT COUNT(*) FROM analysis) - ?))", (self.maxEntries,))
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        if self.connection is not None and self.pid == os.getpid():
+            self.connection.close()
+        self.connection = None
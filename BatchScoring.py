@@ -0,0 +1,176 @@
+import random
+import time
+from itertools import chain
+
+import numpy as np
+
+import ChessEngine, SmartMoveFinder
+
+# plane order of the packed (N x 12 x 64) array, square index = row*8 + col
+PIECES = ['wp', 'wR', 'wN', 'wB', 'wQ', 'wK', 'bp', 'bR', 'bN', 'bB', 'bQ', 'bK']
+pieceIndex = {piece: i for i, piece in enumerate(PIECES)}
+
+# plane index (or -1 for "--") of every two-character square, looked up by its bytes read as one uint16
+squareCodes = np.full(1 << 16, -1, dtype=np.int8)
+for piece, i in pieceIndex.items():
+    squareCodes[np.frombuffer(piece.encode("ascii"), dtype=np.uint16)[0]] = i
+
+# piece-square tables from white's point of view (row 0 is black's back rank). They are used by the
+# batch evaluation only: the engine's scoreMaterial/scoreBoard count material alone, so scorePlanes
+# matches them only when squareWeights is all zeros
+knightScores = [[1, 1, 1, 1, 1, 1, 1, 1],
+                [1, 2, 2, 2, 2, 2, 2, 1],
+                [1, 2, 3, 3, 3, 3, 2, 1],
+                [1, 2, 3, 4, 4, 3, 2, 1],
+                [1, 2, 3, 4, 4, 3, 2, 1],
+                [1, 2, 3, 3, 3, 3, 2, 1],
+                [1, 2, 2, 2, 2, 2, 2, 1],
+                [1, 1, 1, 1, 1, 1, 1, 1]]
+
+bishopScores = [[4, 3, 2, 1, 1, 2, 3, 4],
+                [3, 4, 3, 2, 2, 3, 4, 3],
+                [2, 3, 4, 3, 3, 4, 3, 2],
+                [1, 2, 3, 4, 4, 3, 2, 1],
+                [1, 2, 3, 4, 4, 3, 2, 1],
+                [2, 3, 4, 3, 3, 4, 3, 2],
+                [3, 4, 3, 2, 2, 3, 4, 3],
+                [4, 3, 2, 1, 1, 2, 3, 4]]
+
+queenScores = [[1, 1, 1, 3, 1, 1, 1, 1],
+               [1, 2, 3, 3, 3, 1, 1, 1],
+               [1, 4, 3, 3, 3, 4, 2, 1],
+               [1, 2, 3, 3, 3, 2, 2, 1],
+               [1, 2, 3, 3, 3, 2, 2, 1],
+               [1, 4, 3, 3, 3, 4, 2, 1],
+               [1, 2, 3, 3, 3, 1, 1, 1],
+               [1, 1, 1, 3, 1, 1, 1, 1]]
+
+rookScores = [[4, 3, 4, 4, 4, 4, 3, 4],
+              [4, 4, 4, 4, 4, 4, 4, 4],
+              [1, 1, 2, 3, 3, 2, 1, 1],
+              [1, 2, 3, 4, 4, 3, 2, 1],
+              [1, 2, 3, 4, 4, 3, 2, 1],
+              [1, 1, 2, 3, 3, 2, 1, 1],
+              [4, 4, 4, 4, 4, 4, 4, 4],
+              [4, 3, 4, 4, 4, 4, 3, 4]]
+
+pawnScores = [[8, 8, 8, 8, 8, 8, 8, 8],
+              [8, 8, 8, 8, 8, 8, 8, 8],
+              [5, 6, 6, 7, 7, 6, 6, 5],
+              [2, 3, 3, 5, 5, 3, 3, 2],
+              [1, 2, 3, 4, 4, 3, 2, 1],
+              [1, 1, 2, 3, 3, 2, 1, 1],
+              [1, 1, 1, 0, 0, 1, 1, 1],
+              [0, 0, 0, 0, 0, 0, 0, 0]]
+
+kingScores = [[0] * 8 for _ in range(8)]
+
+piecePositionScores = {"p": pawnScores, "R": rookScores, "N": knightScores,
+                       "B": bishopScores, "Q": queenScores, "K": kingScores}
+
+POSITION_WEIGHT = 0.1
+
+
+def packBoards(gameStates):
+    """Pack the boards of many GameStates into a uint8 (N x 12 x 64) piece-plane array."""
+    squares = "".join(chain.from_iterable(chain.from_iterable(gs.board for gs in gameStates)))
+    codes = squareCodes[np.frombuffer(squares.encode("ascii"), dtype=np.uint16)].reshape(-1, 64)
+    return (codes[:, None, :] == np.arange(len(PIECES), dtype=np.int8)[:, None]).view(np.uint8)
+
+
+def materialWeights(scores=None):
+    """Signed per-plane material weights (12,) built from a pieceScore-style dict."""
+    scores = SmartMoveFinder.pieceScore if scores is None else scores
+    return np.array([(1 if piece[0] == 'w' else -1) * scores[piece[1]] for piece in PIECES], dtype=np.float64)
+
+
+def positionWeights(tables=None, weight=POSITION_WEIGHT):
+    """Signed per-plane piece-square weights (12 x 64); black tables are mirrored vertically."""
+    tables = piecePositionScores if tables is None else tables
+    weights = np.zeros((len(PIECES), 64), dtype=np.float64)
+    for i, piece in enumerate(PIECES):
+        table = np.array(tables[piece[1]], dtype=np.float64)
+        if piece[0] == 'w':
+            weights[i] = weight * table.reshape(64)
+        else:
+            weights[i] = -weight * table[::-1].reshape(64)
+    return weights
+
+
+def scorePlanes(planes, pieceWeights=None, squareWeights=None):
+    """Material plus piece-square score (white positive) for every board in a packed array.
+
+    This is a PST-extended evaluation, not the engine's; pass zeros as squareWeights for the
+    material-only score that SmartMoveFinder.scoreMaterial gives.
+    """
+    pieceWeights = materialWeights() if pieceWeights is None else pieceWeights
+    squareWeights = positionWeights() if squareWeights is None else squareWeights
+    material = planes.sum(axis=2, dtype=np.int64) @ pieceWeights
+    position = planes.reshape(len(planes), len(PIECES) * 64) @ squareWeights.reshape(-1)
+    return material + position
+
+
+def scoreBoards(gameStates):
+    return scorePlanes(packBoards(gameStates))
+
+
+def scoreBoardPerPosition(board):
+    """Plain Python reference for scorePlanes, one board at a time."""
+    score = 0
+    for r in range(8):
+        for c in range(8):
+            square = board[r][c]
+            if square[0] == 'w':
+                score += SmartMoveFinder.pieceScore[square[1]] + POSITION_WEIGHT * piecePositionScores[square[1]][r][c]
+            elif square[0] == 'b':
+                score -= SmartMoveFinder.pieceScore[square[1]] + POSITION_WEIGHT * piecePositionScores[square[1]][7-r][c]
+    return score
+
+
+def randomPositions(count, maxPlies=40, seed=0):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        gs = ChessEngine.GameState()
+        for _ in range(rng.randint(0, maxPlies)):
+            validMoves = gs.getValidMoves()
+            if len(validMoves) == 0:
+                break
+            gs.makeMove(rng.choice(validMoves))
+        snapshot = ChessEngine.GameState()
+        snapshot.board = [row[:] for row in gs.board]
+        snapshot.whiteToMove = gs.whiteToMove
+        positions.append(snapshot)
+    return positions
+
+
+def benchmark(count=2000, repeat=50):
+    positions = randomPositions(count)
+    total = count * repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loopScores = [scoreBoardPerPosition(gs.board) for gs in positions]
+    loopTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        planes = packBoards(positions)
+    packTime = time.perf_counter() - start
+
+    pieceWeights, squareWeights = materialWeights(), positionWeights()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        batchScores = scorePlanes(planes, pieceWeights, squareWeights)
+    scoreTime = time.perf_counter() - start
+
+    assert np.allclose(batchScores, loopScores)
+    materialScores = scorePlanes(planes, pieceWeights, np.zeros_like(squareWeights))
+    assert np.array_equal(materialScores, [SmartMoveFinder.scoreMaterial(gs.board) for gs in positions])
+    print("per-position loop:  %8.0f positions/s" % (total / loopTime))
+    print("pack + batch score: %8.0f positions/s" % (total / (packTime + scoreTime)))
+    print("batch score only:   %8.0f positions/s" % (total / scoreTime))
+
+
+if __name__ == "__main__":
+    benchmark()
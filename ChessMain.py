@@ -7,11 +7,34 @@ DIMENSION = 8
 SQ_SIZE = HEIGHT // DIMENSION
 MAX_FPS = 15
 IMAGES = {}
+SURFACES = {}
+FONTS = {}
+DRAWN = {} # what is currently on screen: (row, col) -> (piece, highlight), "text" -> game over text
 
 def loadImages():
     pieces = ['wp', 'wR', 'wN', 'wB', 'wQ', 'wK', 'bp', 'bR', 'bN', 'bB', 'bQ', 'bK']
     for piece in pieces:
-        IMAGES[piece] = p.transform.scale(p.image.load("images/" + piece + ".png"), (SQ_SIZE, SQ_SIZE))
+        IMAGES[piece] = p.transform.scale(p.image.load("images/" + piece + ".png"), (SQ_SIZE, SQ_SIZE)).convert_alpha()
+
+def loadSurfaces():
+    board = p.Surface((WIDTH, HEIGHT)).convert()
+    colors = [p.Color("white"), p.Color("darkgray")]
+    for r in range(DIMENSION):
+        for c in range(DIMENSION):
+            color = colors[((r+c) % 2)]
+            p.draw.rect(board, color, p.Rect(c*SQ_SIZE, r*SQ_SIZE, SQ_SIZE, SQ_SIZE))
+    SURFACES["board"] = board
+    for color in ['blue', 'yellow']:
+        s = p.Surface((SQ_SIZE, SQ_SIZE)).convert()
+        s.set_alpha(100)
+        s.fill(p.Color(color))
+        SURFACES[color] = s
+
+def getFont(name, size, bold=False, italic=False):
+    key = (name, size, bold, italic)
+    if key not in FONTS:
+        FONTS[key] = p.font.SysFont(name, size, bold, italic)
+    return FONTS[key]
 
 
 def main():
@@ -24,6 +47,7 @@ def main():
     moveMade = False
     animate = False
     loadImages()
+    loadSurfaces()
     running = True
     sqSelected = ()
     playerClicks = []
@@ -36,6 +60,8 @@ def main():
         for e in p.event.get():
             if e.type == p.QUIT:
                 running = False
+            elif e.type == p.VIDEOEXPOSE: # window contents were lost, redraw everything
+                DRAWN.clear()
             elif e.type == p.MOUSEBUTTONDOWN:
                 if not gameOver and humanTurn:
                     location = p.mouse.get_pos()
@@ -88,76 +114,95 @@ def main():
             validMoves = gs.getValidMoves()
             moveMade = False  
             animate = False       
-        drawGameState(screen, gs, validMoves, sqSelected)
+        text = None
         if gs.checkMate:
             gameOver = True
             if gs.whiteToMove:
-                drawText(screen, "Black wins by checkmate")
+                text = "Black wins by checkmate"
             else:
-                drawText(screen, "White wins by checkmate")
+                text = "White wins by checkmate"
         elif gs.staleMate:
             gameOver = True
-            drawText(screen, "Stalemate")
+            text = "Stalemate"
+        dirtyRects = drawGameState(screen, gs, validMoves, sqSelected, text)
         clock.tick(MAX_FPS)
-        p.display.flip()
+        if dirtyRects:
+            p.display.update(dirtyRects)
 
-def highlightSquares(screen, gs, validMoves, sqSelected):
+def highlightSquares(gs, validMoves, sqSelected):
+    highlights = {}
     if sqSelected != ():
         r, c = sqSelected
         if gs.board[r][c][0] == ('w' if gs.whiteToMove else 'b'):
-            s = p.Surface((SQ_SIZE, SQ_SIZE))
-            s.set_alpha(100)
-            s.fill(p.Color('blue'))
-            screen.blit(s, (c*SQ_SIZE, r*SQ_SIZE))
-            s.fill(p.Color('yellow'))
+            highlights[(r, c)] = 'blue'
             for move in validMoves:
                 if move.startRow == r and move.startCol == c:
-                    screen.blit(s, (move.endCol*SQ_SIZE, move.endRow*SQ_SIZE))
-
-def drawGameState(screen, gs, validMoves, sqSelected):
-    drawBoard(screen)
-    highlightSquares(screen, gs, validMoves, sqSelected)
-    drawPieces(screen, gs.board)
-
-def drawBoard(screen):
-    colors = [p.Color("white"), p.Color("darkgray")]
+                    highlights[(move.endRow, move.endCol)] = 'yellow'
+    return highlights
+
+def drawGameState(screen, gs, validMoves, sqSelected, text=None):
+    if text != DRAWN.get("text"):
+        DRAWN.clear()
+        DRAWN["text"] = text
+    highlights = highlightSquares(gs, validMoves, sqSelected)
+    squares = {}
     for r in range(DIMENSION):
         for c in range(DIMENSION):
-            color = colors[((r+c) % 2)]
-            p.draw.rect(screen, color, p.Rect(c*SQ_SIZE, r*SQ_SIZE, SQ_SIZE, SQ_SIZE))
-
-
-def drawPieces(screen, board):
-    for r in range(DIMENSION):
-        for c in range(DIMENSION):
-            piece = board[r][c]
-            if piece != "--":
-                screen.blit(IMAGES[piece], p.Rect(c*SQ_SIZE, r*SQ_SIZE, SQ_SIZE, SQ_SIZE))
+            squares[(r, c)] = (gs.board[r][c], highlights.get((r, c)))
+    dirtyRects = drawSquares(screen, squares)
+    if text is not None and dirtyRects:
+        textRect = drawText(screen, text)
+        if textRect.collidelist(dirtyRects) != -1:
+            dirtyRects.append(textRect)
+    return dirtyRects
+
+def drawSquares(screen, squares):
+    dirtyRects = []
+    for (r, c), square in squares.items():
+        if DRAWN.get((r, c)) == square:
+            continue
+        piece, highlight = square
+        rect = p.Rect(c*SQ_SIZE, r*SQ_SIZE, SQ_SIZE, SQ_SIZE)
+        screen.blit(SURFACES["board"], rect, rect)
+        if highlight is not None:
+            screen.blit(SURFACES[highlight], rect)
+        if piece != "--":
+            screen.blit(IMAGES[piece], rect)
+        DRAWN[(r, c)] = square
+        dirtyRects.append(rect)
+    return dirtyRects
 
 def animateMove(move, screen, board, clock):
-    colors = [p.Color("white"), p.Color("darkgray")]
     dR = move.endRow - move.startRow
     dC = move.endCol - move.startCol
     framesPerSquare = 10
     frameCount = (abs(dR) + abs(dC)) * framesPerSquare
+    squares = {}
+    for r in range(DIMENSION):
+        for c in range(DIMENSION):
+            squares[(r, c)] = (board[r][c], None)
+    squares[(move.endRow, move.endCol)] = (move.pieceCaptured, None)
+    dirtyRects = drawSquares(screen, squares)
+    background = screen.copy()
+    pieceRect = p.Rect(move.startCol*SQ_SIZE, move.startRow*SQ_SIZE, SQ_SIZE, SQ_SIZE)
     for frame in range(frameCount + 1):
         r, c = ((move.startRow + dR*frame/frameCount, move.startCol + dC*frame/frameCount))
-        drawBoard(screen)
-        drawPieces(screen, board)
-        color = colors[(move.endRow + move.endCol) % 2]
-        endSquare = p.Rect(move.endCol*SQ_SIZE, move.endRow*SQ_SIZE, SQ_SIZE, SQ_SIZE)
-        p.draw.rect(screen, color, endSquare)
-        if move.pieceCaptured != '--':
-            screen.blit(IMAGES[move.pieceCaptured], endSquare)
-        screen.blit(IMAGES[move.pieceMoved], p.Rect(c*SQ_SIZE, r*SQ_SIZE, SQ_SIZE, SQ_SIZE))
-        p.display.flip()
+        screen.blit(background, pieceRect, pieceRect)
+        dirtyRects.append(pieceRect)
+        pieceRect = p.Rect(c*SQ_SIZE, r*SQ_SIZE, SQ_SIZE, SQ_SIZE)
+        screen.blit(IMAGES[move.pieceMoved], pieceRect)
+        dirtyRects.append(pieceRect)
+        p.display.update(dirtyRects)
+        dirtyRects = []
         clock.tick(60)
+    del DRAWN[(move.endRow, move.endCol)] # the end square now shows the moved piece
 
 def drawText(screen, text):
-    font = p.font.SysFont("Helvitca", 32, True, False)
+    font = getFont("Helvitca", 32, True, False)
     textObject = font.render(text, 0, p.Color('Black'))
     textLocation = p.Rect(0, 0, WIDTH, HEIGHT).move(WIDTH/2 - textObject.get_width()/2, HEIGHT/2 - textObject.get_height()/2)
     screen.blit(textObject, textLocation)
+    return p.Rect(textLocation.topleft, textObject.get_size())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
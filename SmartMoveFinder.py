@@ -1,4 +1,6 @@
+import os
 import random
+import AnalysisCache
 
 pieceScore = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "p": 1}
 
@@ -6,6 +8,22 @@ CHECKMATE = 1000
 STALEMATE = 0
 DEPTH = 3
 
+SEARCH_VERSION = "minmax-material-1" # change whenever findBestMove's search or evaluation changes
+CACHE_FILE = os.environ.get("CHESS_CACHE_FILE", "analysis_cache.db")
+CACHE_MODE = os.environ.get("CHESS_CACHE_MODE", AnalysisCache.READ_WRITE) # "read-write", "read-only" or "off"
+
+def configureCache(path=None, mode=None):
+    global analysisCache
+    if analysisCache is not None:
+        analysisCache.close()
+    path = CACHE_FILE if path is None else path
+    mode = CACHE_MODE if mode is None else mode
+    version = SEARCH_VERSION + repr(sorted(pieceScore.items()))
+    analysisCache = AnalysisCache.AnalysisCache(path, mode, version)
+
+analysisCache = None
+configureCache()
+
 def findRandomMove(validMoves):
     return validMoves[random.randint(0, len(validMoves)-1)]
 
@@ -40,9 +58,15 @@ def findBestMovesMinMaxNoRecursion(gs, validMoves):
 def findBestMove(gs, validMoves):
     global nextMove
     nextMove = None
+    cached = analysisCache.get(gs, DEPTH)
+    if cached is not None:
+        for move in validMoves:
+            if move.moveID == cached[0]:
+                return move
     random.shuffle(validMoves)
-    findMoveMinMax(gs, validMoves, DEPTH, gs.whiteToMove)
-    #findMoveMinMaxAlphaBeta(gs, validMoves, DEPTH, -CHECKMATE, CHECKMATE, gs.whiteToMove)
+    score = findMoveMinMax(gs, validMoves, DEPTH, gs.whiteToMove)
+    #score = findMoveMinMaxAlphaBeta(gs, validMoves, DEPTH, -CHECKMATE, CHECKMATE, gs.whiteToMove)
+    analysisCache.put(gs, nextMove, score, DEPTH)
     return nextMove
 
 def findMoveMinMax(gs, validMoves, depth, whiteToMove):